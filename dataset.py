@@ -0,0 +1,205 @@
+import argparse
+import contextlib
+import io
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from machine import MACHINE, SOLVE_LIMIT
+from options import PLAYERS
+
+"""
+    [ Dataset ]
+    Evaluation / Move ordering 튜닝을 위한 Position 데이터셋.
+    정확한 값(value)과 최선의 수(best_move)는 남은 Line 수가 max_solve 이하이고
+    MACHINE.count_states가 max_states 이하일 때 MACHINE.solve로 계산함
+
+    - points:    (N, 7) uint8   -> 7 x 7 Board의 점 bitset (np.packbits, index = x * 7 + y)
+    - drawn:     (N, 147) uint8 -> 그려진 Line의 bitset (np.packbits, index = SEGMENTS 내 위치)
+    - scores:    (N, 2) int16   -> [USER, MACHINE] 점수
+    - to_move:   (N,) int8      -> 둘 차례인 Player (PLAYERS 내 위치)
+    - value:     (N,) int16     -> 둘 차례인 Player 기준 남은 게임의 정확한 점수 차
+    - best_move: (N,) int16     -> 최선의 수 (SEGMENTS 내 위치)
+"""
+
+BOARD_SIZE = 7
+GRID = [(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)]
+SEGMENTS = list(combinations(GRID, 2))
+SEGMENT_INDEX = {segment: idx for idx, segment in enumerate(SEGMENTS)}
+FIELDS = ["points", "drawn", "scores", "to_move", "value", "best_move"]
+SHAPES = [((len(GRID) + 7) // 8,), ((len(SEGMENTS) + 7) // 8,), (2,), (), (), ()]
+DTYPES = [np.uint8, np.uint8, np.int16, np.int8, np.int16, np.int16]
+
+
+def segment_index(line):
+    return SEGMENT_INDEX[tuple(sorted(line))]
+
+
+def load_boards(board_dir="./board_library"):
+    boards = []
+    for name in sorted(os.listdir(board_dir)):
+        map = pd.read_csv(os.path.join(board_dir, name), index_col="Unnamed: 0")
+        boards.append([point for point in GRID if map.loc[point[1]].iloc[point[0]]])
+    return boards
+
+
+def sample_board(rng, boards):
+    # Same choices as the GUI: "Random 5/10/15/20" or one of the library maps
+    choice = rng.randrange(4 + len(boards))
+    if choice < 4:
+        return rng.sample(GRID, 5 * (choice + 1))
+    return list(boards[choice - 4])
+
+
+def encode(whole_points, drawn_lines, score, turn, value, best_move):
+    points = np.zeros(len(GRID), dtype=bool)
+    for x, y in whole_points:
+        points[x * BOARD_SIZE + y] = True
+
+    drawn = np.zeros(len(SEGMENTS), dtype=bool)
+    for line in drawn_lines:
+        drawn[segment_index(line)] = True
+
+    return (
+        np.packbits(points),
+        np.packbits(drawn),
+        np.array(score, dtype=np.int16),
+        turn,
+        value,
+        segment_index(best_move),
+    )
+
+
+def stack(samples):
+    # Samples -> one array per field, with explicit shapes even when there are none
+    columns = zip(*samples) if samples else [[] for _ in FIELDS]
+    return {
+        field: np.array(column, dtype=dtype).reshape((-1, *shape))
+        for field, column, shape, dtype in zip(FIELDS, columns, SHAPES, DTYPES)
+    }
+
+
+def play_game(seed, boards, max_solve=10, engine_rate=0.0, engine_depth=1, max_states=SOLVE_LIMIT):
+    """
+        seed로 결정되는 게임 하나를 끝까지 진행하고, 풀 수 있는 Position들을 반환
+        - 수는 engine_rate 확률로 MACHINE(engine_depth 깊이의 min_max), 나머지는 무작위로 선택
+    """
+    rng = random.Random(seed)
+    whole_points = sample_board(rng, boards)
+
+    machine = MACHINE(whole_points=whole_points)
+    machine.drawable_lines = [
+        [dot1, dot2]
+        for (dot1, dot2) in combinations(whole_points, 2)
+        if machine.check_availability([dot1, dot2])
+    ]
+
+    score = [0, 0]  # USER, MACHINE
+    turn = rng.randrange(len(PLAYERS))
+    samples = []
+
+    while machine.drawable_lines:
+        if len(machine.drawable_lines) <= max_solve:
+            # solve has no limit of its own, skip positions with too many states
+            regions = machine.find_regions()
+            if machine.count_states(regions) <= max_states:
+                value, best_move = machine.solve(regions)
+                samples.append(encode(whole_points, machine.drawn_lines, score, turn, value, best_move))
+
+        if rng.random() < engine_rate:
+            # A shallow search keeps engine moves cheap on open boards
+            with contextlib.redirect_stdout(io.StringIO()):
+                choice = machine.min_max(limit=engine_depth)
+        else:
+            choice = rng.choice(machine.drawable_lines)
+        machine.update_drawable_lines(choice)
+
+        score[turn] += machine.calc_earn_point(choice)
+        machine.drawn_lines.append(choice)
+        turn = 1 - turn
+
+    return samples
+
+
+def play_games(seeds, boards, max_solve=10, engine_rate=0.0, engine_depth=1, max_states=SOLVE_LIMIT):
+    # Runs in a worker, only the stacked arrays go back to the parent
+    samples = []
+    for seed in seeds:
+        samples.extend(play_game(seed, boards, max_solve, engine_rate, engine_depth, max_states))
+    return stack(samples)
+
+
+def generate(num_games, seed=0, workers=None, max_solve=10, engine_rate=0.0, engine_depth=1, max_states=SOLVE_LIMIT, chunk_size=None):
+    boards = load_boards()
+    if chunk_size is None:
+        # A few chunks per worker, each small enough to keep the pool busy
+        chunk_size = max(1, min(64, num_games // (4 * (workers or os.cpu_count() or 1))))
+    chunks = [
+        range(seed + start, seed + min(start + chunk_size, num_games))
+        for start in range(0, num_games, chunk_size)
+    ]
+
+    parts = [stack([])]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts.extend(executor.map(
+            play_games,
+            chunks,
+            [boards] * len(chunks),
+            [max_solve] * len(chunks),
+            [engine_rate] * len(chunks),
+            [engine_depth] * len(chunks),
+            [max_states] * len(chunks),
+        ))
+
+    return {field: np.concatenate([part[field] for part in parts]) for field in FIELDS}
+
+
+def save_dataset(dataset, path):
+    """
+        path가 .npz로 끝나면 압축된 npz, 아니면 Field별 .npy 파일을 담은 디렉토리로 저장
+    """
+    if path.endswith(".npz"):
+        np.savez_compressed(path, **dataset)
+        return
+
+    os.makedirs(path, exist_ok=True)
+    for field, array in dataset.items():
+        np.save(os.path.join(path, f"{field}.npy"), array)
+
+
+def load_dataset(path, mmap=True):
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {field: data[field] for field in FIELDS}
+
+    mmap_mode = "r" if mmap else None
+    return {
+        field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode=mmap_mode)
+        for field in FIELDS
+    }
+
+
+def unpack_drawn(drawn):
+    # (N, 147) uint8 -> (N, len(SEGMENTS)) bool
+    return np.unpackbits(drawn, axis=-1, count=len(SEGMENTS)).astype(bool)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate labeled Gaining Territory positions")
+    parser.add_argument("output", help="*.npz file, or a directory of memory-mappable .npy files")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-solve", type=int, default=10, help="Solve positions with at most this many drawable lines")
+    parser.add_argument("--engine-rate", type=float, default=0.0, help="Probability of an engine move instead of a random one")
+    parser.add_argument("--engine-depth", type=int, default=1, help="min_max limit used for engine moves")
+    parser.add_argument("--max-states", type=int, default=SOLVE_LIMIT, help="Skip positions whose solve would exceed this many states")
+    args = parser.parse_args()
+
+    dataset = generate(args.games, args.seed, args.workers, args.max_solve, args.engine_rate, args.engine_depth, args.max_states)
+    save_dataset(dataset, args.output)
+    print(f"Saved {len(dataset['value'])} positions to {args.output}")
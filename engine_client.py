@@ -0,0 +1,102 @@
+import json
+import socket
+import time
+from itertools import combinations
+
+from machine import MACHINE
+from options import ENGINE_BUDGET, ENGINE_GRACE
+
+
+class ENGINE_CLIENT:
+    """
+    [ ENGINE_CLIENT ]
+    ENGINE_SERVER에 수를 요청하는 MACHINE 대체 객체.
+    - SYSTEM이 MACHINE과 동일하게 변수를 주입하고 find_best_selection을 호출함
+    - 서버에 연결할 수 없거나 응답이 없으면 남은 시간 예산(budget) 안에서 in-process MACHINE으로 수를 선택
+    - 그을 수 있는 Line이 없으면 None을 반환
+
+    - address: (host, port) 또는 Unix socket 경로
+    - budget: 한 수를 선택하는 데 허용하는 시간 (초)
+    """
+
+    def __init__(self, address, budget=ENGINE_BUDGET):
+        self.id = "MACHINE"
+        self.score = [0, 0]  # USER, MACHINE
+        self.drawn_lines = []  # Drawn Lines
+        self.board_size = 7  # 7 x 7 Matrix
+        self.num_dots = 0
+        self.whole_points = []
+        self.location = []
+        self.triangles = []
+
+        self.address = address
+        self.budget = budget
+        self.socket = None
+        self.connection = None
+        self.fallback = MACHINE()
+
+    def connect(self):
+        if isinstance(self.address, str):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # The server answers within the budget plus its grace period
+        self.socket.settimeout(self.budget + ENGINE_GRACE)
+        self.socket.connect(self.address)
+        self.connection = self.socket.makefile("rw")
+
+    def disconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+        if self.socket is not None:
+            self.socket.close()
+        self.socket = None
+        self.connection = None
+
+    def request(self):
+        if self.connection is None:
+            self.connect()
+
+        request = {
+            "whole_points": self.whole_points,
+            "drawn_lines": self.drawn_lines,
+            "budget": self.budget,
+        }
+        self.connection.write(json.dumps(request) + "\n")
+        self.connection.flush()
+
+        message = self.connection.readline()
+        if not message:
+            raise ConnectionError("engine server closed the connection")
+        response = json.loads(message)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        if response.get("line") is None:
+            # No line left to draw
+            return None
+        return [tuple(point) for point in response["line"]]
+
+    def find_best_selection(self):
+        deadline = time.time() + self.budget
+        try:
+            return self.request()
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Engine server unavailable ({e}), searching locally", flush=True)
+            self.disconnect()
+
+        self.fallback.score = self.score
+        self.fallback.drawn_lines = self.drawn_lines
+        self.fallback.whole_points = self.whole_points
+        self.fallback.location = self.location
+        self.fallback.triangles = self.triangles
+        # The fallback may have missed turns, so rebuild its drawable lines
+        self.fallback.drawable_lines = [
+            [dot1, dot2]
+            for (dot1, dot2) in combinations(self.whole_points, 2)
+            if self.fallback.check_availability([dot1, dot2])
+        ]
+        if not self.fallback.drawable_lines:
+            return None
+
+        # Only what is left of the budget, at least a one-move lookahead
+        return self.fallback.search_until(deadline)[0]
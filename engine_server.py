@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from machine import MACHINE, normalize_line
+from options import ENGINE_HOST, ENGINE_PORT, ENGINE_BUDGET, ENGINE_GRACE, ENGINE_CACHE_SIZE
+
+"""
+    [ Protocol ]
+    한 줄에 하나의 JSON 객체를 주고받음 (newline-delimited JSON)
+
+    - Request : {"whole_points": [[x, y], ...], "drawn_lines": [[[x1, y1], [x2, y2]], ...], "budget": 10.0}
+    - Response: {"line": [[x1, y1], [x2, y2]]} 또는 {"error": "..."}
+"""
+
+# Worker-local cache: whole_points -> lines that are drawable on the empty board
+_board_cache = {}
+
+
+def position_key(whole_points, drawn_lines):
+    # The machine's choice only depends on the board and the set of drawn lines
+    return (
+        tuple(sorted(tuple(point) for point in whole_points)),
+        tuple(sorted(normalize_line(map(tuple, line)) for line in drawn_lines)),
+    )
+
+
+def search_position(key, deadline):
+    """
+        Worker process에서 실행되는 함수.
+        같은 Board라면 빈 Board의 drawable_lines를 재사용하고, 그려진 Line들만 반영함
+        - deadline이 지나면 탐색을 멈추고 마지막으로 끝까지 마친 깊이의 결과를 반환
+        - 반환: (line, complete)
+    """
+    whole_points, drawn_lines = key
+    whole_points = list(whole_points)
+    drawn_lines = [list(line) for line in drawn_lines]
+
+    machine = MACHINE(whole_points=whole_points)
+
+    if key[0] not in _board_cache:
+        _board_cache[key[0]] = [
+            [dot1, dot2]
+            for (dot1, dot2) in combinations(whole_points, 2)
+            if machine.check_availability([dot1, dot2])
+        ]
+
+    # Remove the drawn lines themselves, then every line they cross
+    drawn = set(key[1])
+    machine.drawable_lines = [
+        line for line in _board_cache[key[0]] if normalize_line(line) not in drawn
+    ]
+    for line in drawn_lines:
+        machine.update_drawable_lines(line)
+    machine.drawn_lines = drawn_lines
+
+    if not machine.drawable_lines:
+        return (None, True)
+
+    # MACHINE prints the whole search tree, keep the workers quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        choice, complete = machine.search_until(deadline)
+    return ([list(point) for point in choice], complete)
+
+
+class ENGINE_SERVER:
+    """
+    [ ENGINE_SERVER ]
+    여러 Client(GUI, Script)가 공유하는 MACHINE 탐색 서버.
+
+    - executor: 미리 띄워 둔(warm) Worker Process Pool
+    - cache: 탐색한 Position의 결과 (position_key -> (Line, 탐색에 준 budget), LRU)
+        * 같거나 더 짧은 budget의 요청은 탐색 없이 재사용 (끝까지 탐색한 결과는 항상 재사용)
+    - pending: 탐색 중인 Position의 Future들 (position_key -> [(deadline, Future), ...])
+        * 요청의 deadline보다 늦지 않고 ENGINE_GRACE 이상 이르지 않은 탐색이 있으면 새로 탐색하지 않고 기다림
+    - 새 Position은 바로 Worker에 전달함 (batch 없음)
+        * 요청마다 deadline이 달라, 여러 Position을 한 Worker에 묶으면 앞선 탐색이 끝날 때까지 뒤의 요청이 기다려야 함
+    """
+
+    def __init__(self, workers=None, cache_size=ENGINE_CACHE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_size = cache_size
+
+        self.executor = None
+        self.cache = OrderedDict()
+        self.pending = {}
+
+    def start_workers(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Spawn every worker now so that the first requests don't pay for it
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    async def best_move(self, whole_points, drawn_lines, budget=ENGINE_BUDGET):
+        key = position_key(whole_points, drawn_lines)
+
+        cached = self.cache.get(key)
+        if cached is not None and cached[1] >= budget:
+            self.cache.move_to_end(key)
+            return cached[0]
+
+        # Join a search that ends before this request's deadline, but not much earlier
+        deadline = time.time() + budget
+        joinable = [
+            (task_deadline, task)
+            for task_deadline, task in self.pending.get(key, [])
+            if deadline - ENGINE_GRACE <= task_deadline <= deadline
+        ]
+        if joinable:
+            _, task = max(joinable, key=lambda pending: pending[0])
+        else:
+            loop = asyncio.get_running_loop()
+            task = loop.run_in_executor(self.executor, search_position, key, deadline)
+            task.add_done_callback(lambda task: self.finish(key, deadline, budget, task))
+            self.pending.setdefault(key, []).append((deadline, task))
+
+        # The worker stops by itself at the deadline, the grace covers queueing and the reply
+        line, _ = await asyncio.wait_for(asyncio.shield(task), timeout=budget + ENGINE_GRACE)
+        return line
+
+    def finish(self, key, deadline, budget, task):
+        self.pending[key].remove((deadline, task))
+        if not self.pending[key]:
+            del self.pending[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        # A search cut off by its deadline only answers requests with the same or a shorter budget
+        line, complete = task.result()
+        budget = math.inf if complete else budget
+
+        cached = self.cache.get(key)
+        if cached is None or cached[1] < budget:
+            self.cache[key] = (line, budget)
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                message = await reader.readline()
+                if not message:
+                    break
+
+                try:
+                    request = json.loads(message)
+                    line = await self.best_move(
+                        request["whole_points"],
+                        request.get("drawn_lines", []),
+                        request.get("budget", ENGINE_BUDGET),
+                    )
+                    response = {"line": line}
+                except asyncio.TimeoutError:
+                    response = {"error": "timeout"}
+                except Exception as e:
+                    response = {"error": repr(e)}
+
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host=ENGINE_HOST, port=ENGINE_PORT, path=None):
+        self.start_workers()
+        try:
+            if path:
+                server = await asyncio.start_unix_server(self.handle_client, path=path)
+            else:
+                server = await asyncio.start_server(self.handle_client, host=host, port=port)
+
+            print(f"Engine listening on {path or f'{host}:{port}'} ({self.workers} workers)", flush=True)
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gaining Territory engine server")
+    parser.add_argument("--host", default=ENGINE_HOST)
+    parser.add_argument("--port", type=int, default=ENGINE_PORT)
+    parser.add_argument("--unix", default=None, help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    engine = ENGINE_SERVER(workers=args.workers)
+    try:
+        asyncio.run(engine.serve(host=args.host, port=args.port, path=args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -1,8 +1,18 @@
 import time
-from itertools import combinations, product, chain
+from itertools import combinations, product
 from shapely.geometry import LineString, Point, Polygon
 
 INF = 1_000_000
+SOLVE_LIMIT = 2**15  # Maximum number of positions to search to the end
+REGION_LIMIT = 40  # Maximum number of drawable lines to split into regions
+
+
+def normalize_line(line):
+    return tuple(sorted(line))
+
+
+class SearchTimeout(Exception):
+    pass
 
 
 class MACHINE:
@@ -58,7 +68,24 @@ class MACHINE:
             self.update_drawable_lines(newly_drawn_line)
 
         choice = []
-        if len(self.drawable_lines) > 13:
+        regions = None
+        if len(self.drawable_lines) <= REGION_LIMIT:
+            regions = self.find_regions()
+
+        if regions is not None and self.count_states(regions) <= SOLVE_LIMIT:
+            start_time = time.perf_counter()
+            expectation, choice = self.solve(regions)
+            end_time = time.perf_counter()
+            print(
+                "selection : {choice}, expection : {expectation}, regions : {regions} - ({time}ms)".format(
+                    choice=choice,
+                    expectation=expectation,
+                    regions=len(regions[0]),
+                    time=int(round((end_time - start_time) * 1000)),
+                ),
+                flush=True,
+            )
+        elif len(self.drawable_lines) > 13:
             choice = self.min_max(limit=3)
         elif len(self.drawable_lines) > 7:
             choice = self.min_max(limit=5)
@@ -70,8 +97,10 @@ class MACHINE:
         # self.drawn_lines.append(choice)
         return choice
 
-    def min_max(self, limit):
+    def min_max(self, limit, deadline=None):
         def step_machine(cutoff, cur_limit, indent=""):
+            if deadline is not None and time.time() > deadline:
+                raise SearchTimeout
             best_value = -INF
             best_choice = None
 
@@ -110,6 +139,8 @@ class MACHINE:
             return (best_value, best_choice)
 
         def step_user(cutoff, cur_limit, indent=""):
+            if deadline is not None and time.time() > deadline:
+                raise SearchTimeout
             worst_value = INF
             worst_choice = None
 
@@ -161,6 +192,210 @@ class MACHINE:
         )
         return choice
 
+    def solve(self, regions=None, deadline=None):
+        """
+        남은 게임을 끝까지 탐색하여 정확한 값을 계산 (출력 없음)
+        - 반환: (value, choice) -> value는 현재 둘 차례인 Player 기준 (획득 점수 - 상대 획득 점수)
+        - Position은 Region별 상태로 구분하여 결과를 재사용
+            * 남은 Line이 없는 Region은 이후 값에 영향을 주지 않으므로 제외
+            * Line이 하나뿐인 Region은 얻는 점수가 같으면 서로 바꿔도 같은 Position이므로 개수만 사용
+        """
+        if regions is None:
+            regions = self.find_regions()
+        regions, triangles, crosses = regions
+
+        if not regions:
+            return (0, None)
+
+        drawn = set(normalize_line(line) for line in self.drawn_lines)
+        remaining = set(triangles)
+
+        region_of = {}
+        region_left = []
+        single_lines = set()
+        singles = {}  # earn point -> remaining single-line regions
+        for idx, region in enumerate(regions):
+            region_left.append(len(region))
+            for line in region:
+                region_of[line] = idx
+            if len(region) == 1:
+                # All other sides of its triangles are already drawn
+                single_lines.add(region[0])
+                singles.setdefault(len(triangles[region[0]]), []).append(region[0])
+        earns = sorted(singles)
+
+        cache = {}
+        played = []
+
+        def play(line):
+            deleted_lines = (crosses[line] & remaining) | {line}
+            remaining.difference_update(deleted_lines)
+            for deleted_line in deleted_lines:
+                region_left[region_of[deleted_line]] -= 1
+            drawn.add(line)
+            played.append(line)
+            return deleted_lines
+
+        def undo(deleted_lines):
+            drawn.remove(played.pop())
+            for deleted_line in deleted_lines:
+                region_left[region_of[deleted_line]] += 1
+            remaining.update(deleted_lines)
+
+        def step():
+            if deadline is not None and time.time() > deadline:
+                raise SearchTimeout
+            key = (
+                frozenset(line for line in remaining if line not in single_lines),
+                frozenset(line for line in played if region_left[region_of[line]]),
+                tuple(len(singles[earn]) for earn in earns),
+            )
+            if key in cache:
+                return cache[key]
+
+            # Try a single representative of each group of interchangeable lines
+            choosable_lines = [line for line in remaining if line not in single_lines]
+            choosable_lines += [singles[earn][-1] for earn in earns if singles[earn]]
+
+            best_value = -INF
+            best_choice = None
+            for choice in choosable_lines:
+                cur_value = sum(1 for side1, side2 in triangles[choice] if side1 in drawn and side2 in drawn)
+
+                # play choice
+                if choice in single_lines:
+                    singles[len(triangles[choice])].pop()
+                deleted_lines = play(choice)
+
+                # the opponent moves next
+                if remaining:
+                    cur_value -= step()[0]
+
+                # undo choice
+                undo(deleted_lines)
+                if choice in single_lines:
+                    singles[len(triangles[choice])].append(choice)
+
+                if cur_value > best_value:
+                    best_value = cur_value
+                    best_choice = choice
+
+            cache[key] = (best_value, best_choice)
+            return cache[key]
+
+        value, choice = step()
+        return (value, list(choice))
+
+    def search_until(self, deadline):
+        """
+        deadline(time.time() 기준)까지 탐색 깊이를 늘려가며 수를 선택
+        - 최소한 한 수 앞(limit=0)은 항상 탐색
+        - 시간이 다 되면 마지막으로 끝까지 마친 깊이의 결과를 사용
+        - 반환: (choice, complete) -> complete는 남은 게임을 끝까지 탐색했는지 여부
+        """
+        choice = self.min_max(limit=0)
+
+        drawn_count = len(self.drawn_lines)
+        drawable_lines = self.drawable_lines.copy()
+        try:
+            regions = None
+            if len(self.drawable_lines) <= REGION_LIMIT:
+                regions = self.find_regions()
+
+            if regions is not None and self.count_states(regions) <= SOLVE_LIMIT:
+                return (self.solve(regions, deadline)[1], True)
+
+            for limit in range(1, len(self.drawable_lines)):
+                choice = self.min_max(limit, deadline)
+        except SearchTimeout:
+            # Undo the moves of the interrupted search
+            del self.drawn_lines[drawn_count:]
+            self.drawable_lines = drawable_lines
+            return (choice, False)
+        return (choice, True)
+
+    def count_states(self, regions):
+        """
+        solve가 탐색하는 Position 수의 상한
+        """
+        regions, triangles, _ = regions
+
+        states = 1
+        singles = {}  # earn point -> number of single-line regions
+        for region in regions:
+            if len(region) == 1:
+                earn = len(triangles[region[0]])
+                singles[earn] = singles.get(earn, 0) + 1
+            else:
+                states *= 2 ** len(region)
+        for count in singles.values():
+            states *= count + 1
+        return states
+
+    def find_regions(self):
+        """
+        drawable_lines를 서로 영향을 주지 않는 Region들로 분할
+        - 서로 교차하는 Line들, 함께 하나의 삼각형을 이룰 수 있는 Line들은 같은 Region에 속함
+        - 한 Region에서 둔 수는 다른 Region의 남은 Line과 얻을 수 있는 점수를 바꾸지 않음
+        - 반환: (regions, triangles, crosses)
+            * triangles: Line -> 이 Line으로 완성할 수 있는 빈 삼각형의 나머지 두 변 [(side1, side2), ...]
+            * crosses: Line -> 이 Line을 그으면 그을 수 없게 되는 Line들
+        """
+        lines = [normalize_line(line) for line in self.drawable_lines]
+        drawn = set(normalize_line(line) for line in self.drawn_lines)
+        sides = drawn | set(lines)
+
+        parent = {line: line for line in lines}
+
+        def find(line):
+            while parent[line] != line:
+                parent[line] = parent[parent[line]]
+                line = parent[line]
+            return line
+
+        def union(line1, line2):
+            parent[find(line1)] = find(line2)
+
+        # Lines that could close the same empty triangle
+        triangles = {line: [] for line in lines}
+        for line in lines:
+            dot1, dot2 = line
+            for dot in self.whole_points:
+                if dot in line:
+                    continue
+                side1 = normalize_line([dot1, dot])
+                side2 = normalize_line([dot2, dot])
+                if side1 not in sides or side2 not in sides:
+                    continue
+
+                triangle = Polygon([dot1, dot2, dot])
+                if any(
+                    bool(triangle.intersection(Point(other)))
+                    for other in self.whole_points
+                    if other not in (dot1, dot2, dot)
+                ):
+                    continue
+
+                triangles[line].append((side1, side2))
+                for side in (side1, side2):
+                    if side in parent:
+                        union(line, side)
+
+        # Lines that cross each other
+        crosses = {line: set() for line in lines}
+        for line1, line2 in combinations(lines, 2):
+            if len(set([*line1, *line2])) == 3:
+                continue
+            if bool(LineString(line1).intersection(LineString(line2))):
+                crosses[line1].add(line2)
+                crosses[line2].add(line1)
+                union(line1, line2)
+
+        regions = {}
+        for line in lines:
+            regions.setdefault(find(line), []).append(line)
+        return (list(regions.values()), triangles, crosses)
+
     def check_availability(self, line):
         line_string = LineString(line)
         dot1, dot2 = line
@@ -226,7 +461,7 @@ class MACHINE:
             for dot in self.whole_points:
                 if dot in vertices:
                     continue
-                if bool(Polygon(chain(line, line1, line2)).intersection(Point(dot))):
+                if bool(Polygon(list(vertices)).intersection(Point(dot))):
                     isEmpty = False
                     break
 
@@ -23,3 +23,11 @@ CIRCLE_WIDTH = 4
 CIRCLE_COLOR = "white"
 RADIUS = 8
 
+
+# Engine Server
+ENGINE_ADDRESS = None # None: in-process MACHINE, ("127.0.0.1", 8765) or "/tmp/gaining_territory.sock": ENGINE_SERVER
+ENGINE_HOST = "127.0.0.1"
+ENGINE_PORT = 8765
+ENGINE_BUDGET = 10.0 # Seconds per move
+ENGINE_GRACE = 1.0 # Seconds allowed over the budget for queueing and the round trip
+ENGINE_CACHE_SIZE = 100_000
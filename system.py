@@ -7,8 +7,9 @@ import pandas as pd
 from shapely.geometry import LineString, Point, Polygon
 
 from machine import MACHINE
+from engine_client import ENGINE_CLIENT
 from options import PLAYERS, BACKGROUND, RADIUS, LINE_WIDTH, LINE_COLOR, CIRCLE_WIDTH, CIRCLE_COLOR, \
-                    USER_COLOR, MACHINE_COLOR, PROGRAM_SIZE, CANVAS_SIZE, GRID_COLOR
+                    USER_COLOR, MACHINE_COLOR, PROGRAM_SIZE, CANVAS_SIZE, GRID_COLOR, ENGINE_ADDRESS
 
 class SYSTEM():
     def __init__(self):
@@ -30,6 +31,7 @@ class SYSTEM():
             - location: Canvas 상의 좌표 값
             - board_size: Board 판의 크기 (각 축이 갖는 상자의 수; 7로 고정)
             - machine: MACHINE 객체 ( USER는 별도의 객체를 사용하지 않음)
+               * ENGINE_ADDRESS가 설정되면 ENGINE_SERVER에 수를 요청하는 ENGINE_CLIENT 사용
         
         """
         # Initialization
@@ -44,7 +46,7 @@ class SYSTEM():
         self.turn = None
         self.interval = None
         self.offset = None
-        self.machine = MACHINE()
+        self.machine = MACHINE() if ENGINE_ADDRESS is None else ENGINE_CLIENT(ENGINE_ADDRESS)
 
         self.get_score = False
 
@@ -276,6 +278,9 @@ class SYSTEM():
         self.machine.triangles = self.triangles
 
         line = self.machine.find_best_selection()
+        if line is None: # ENGINE_CLIENT: no line left to draw
+            self.label_warning.config(text="No line left to draw!")
+            return
         line = self.organize_points(line)
 
         if self.check_availability("MACHINE", line ):